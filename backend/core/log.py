@@ -0,0 +1,179 @@
+"""
+Logging structuré (JSON) et non bloquant.
+
+Pipeline :
+    logger.info(...) → filtres (request_id, échantillonnage) → QueueLogHandler
+    → file bornée → thread QueueListener → formatage JSON → stderr
+
+Le thread de la requête ne fait que déposer l'enregistrement dans une file
+en mémoire : l'écriture (et la sérialisation JSON) se fait dans un thread
+séparé. Si la sortie est lente et que la file est pleine, les logs sont
+abandonnés (et comptés) plutôt que de bloquer la requête.
+
+Usage dans le code :
+    logger = logging.getLogger(__name__)
+    logger.info("Connexion réussie", extra={'event': 'auth.signin', 'user_id': str(user.pk)})
+
+Configuration : voir LOGGING dans core/settings.py.
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+# Identifiant de la requête en cours (rempli par core.middleware.RequestIdMiddleware)
+request_id_var = contextvars.ContextVar('request_id', default=None)
+
+# Attributs standards d'un LogRecord (tout le reste vient de `extra=`)
+RESERVED_ATTRS = set(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
+
+
+class RequestIdFilter(logging.Filter):
+    """Ajoute l'identifiant de la requête en cours à chaque log."""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Échantillonne les événements à fort volume.
+
+    Args:
+        rates: {'nom.evenement': taux} avec un taux entre 0 et 1,
+               ex. {'auth.me': 0.01} ne garde qu'un log /me/ sur 100.
+
+    Le taux est ajouté au log (sample_rate) pour pouvoir extrapoler les volumes.
+    Les WARNING et plus ne sont jamais échantillonnés.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates or {}
+
+    def filter(self, record):
+        rate = self.rates.get(getattr(record, 'event', None))
+        if rate is None or record.levelno >= logging.WARNING:
+            return True
+        record.sample_rate = rate
+        return random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Formate un log en une ligne JSON."""
+
+    def format(self, record):
+        data = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        data.update(
+            (key, value) for key, value in record.__dict__.items()
+            if key not in RESERVED_ATTRS and not key.startswith('_')
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class QueueLogHandler(logging.handlers.QueueHandler):
+    """
+    Handler qui délègue l'écriture à un thread via une file bornée.
+
+    Args:
+        maxsize: Taille maximale de la file. Au-delà, les logs sont abandonnés.
+        stream: Flux de sortie du thread d'écriture (stderr par défaut).
+
+    Le formatter configuré sur ce handler est appliqué par le thread
+    d'écriture, pas par le thread de la requête.
+    """
+
+    def __init__(self, maxsize=10000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.sink = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self._listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        atexit.register(self._stop_listener)
+
+    def setFormatter(self, fmt):
+        self.sink.setFormatter(fmt)
+
+    def prepare(self, record):
+        """
+        Prépare le log pour la file, sans le formater.
+
+        Le message est résolu ici (les arguments peuvent être des objets
+        mutables) ; la sérialisation JSON se fera dans le thread d'écriture.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            notice = logging.makeLogRecord({
+                'name': __name__,
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': "%d logs abandonnés (file pleine)" % dropped,
+                'event': 'logging.dropped',
+                'dropped': dropped,
+            })
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                self.dropped += dropped
+
+    def emit(self, record):
+        # Le thread d'écriture ne survit pas à un fork (gunicorn --preload) :
+        # on le (re)démarre à la demande dans chaque process
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
+
+    def _start_listener(self):
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            if self._listener_pid is not None:
+                # Process enfant : la file héritée du parent n'est plus consommée
+                self.queue = queue.Queue(self.queue.maxsize)
+            self._listener = logging.handlers.QueueListener(self.queue, self.sink)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def _stop_listener(self):
+        if self._listener is None or self._listener_pid != os.getpid():
+            return
+        try:
+            self._listener.stop()
+        except queue.Full:
+            pass
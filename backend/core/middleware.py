@@ -0,0 +1,100 @@
+"""
+Middlewares du projet.
+"""
+
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .log import request_id_var
+from .routers import RoutingState, mark_unusable_replicas_down, routing_state_var
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Un identifiant fourni par le client (ou le load balancer) n'est repris
+# que s'il est court et sans caractères exotiques (injection dans les logs)
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,128}$')
+
+
+class RequestIdMiddleware:
+    """
+    Attribue un identifiant à chaque requête.
+
+    - Reprend le header X-Request-ID s'il est présent et valide, sinon en génère un
+    - Le rend disponible pour les logs (voir core.log.RequestIdFilter)
+    - Le renvoie dans le header X-Request-ID de la réponse
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get(REQUEST_ID_HEADER, '')
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        request.request_id = request_id
+        token = request_id_var.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+
+        response[REQUEST_ID_HEADER] = request_id
+        return response
+
+
+class PrimaryPinningMiddleware:
+    """
+    Épingle un utilisateur à la base primaire juste après une écriture.
+
+    Si la requête a écrit en base (inscription, modification du profil...),
+    un cookie est posé pour REPLICA_PIN_SECONDS : pendant cette fenêtre, les
+    lectures de ses requêtes vont sur le primaire et ne voient jamais des
+    données pas encore répliquées (voir core/routers.py).
+
+    Si la requête échoue sur une erreur de base, les réplicas qu'elle a lus et
+    dont la connexion est coupée sont écartés pour les requêtes suivantes.
+    """
+
+    cookie_name = 'db_pin'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+        self.enabled = bool(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+    def __call__(self, request):
+        state = RoutingState(pinned=self._is_pinned(request))
+        token = routing_state_var.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state_var.reset(token)
+
+        if self.enabled and state.wrote:
+            response.set_cookie(
+                key=self.cookie_name,
+                value=str(int(time.time()) + self.pin_seconds),
+                max_age=self.pin_seconds,
+                httponly=True,
+                secure=not settings.DEBUG,
+                samesite='Lax',
+            )
+        return response
+
+    def process_exception(self, request, exception):
+        state = routing_state_var.get()
+        if isinstance(exception, DatabaseError) and state is not None and state.replicas:
+            mark_unusable_replicas_down(state.replicas)
+        return None
+
+    def _is_pinned(self, request):
+        # Le cookie contient l'échéance : on ne se fie pas qu'à son max_age
+        try:
+            return int(request.COOKIES.get(self.cookie_name, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,188 @@
+"""
+Profilage à la demande des requêtes (cProfile).
+
+Une requête est profilée si :
+- Elle porte le header X-Profile avec un token signé d'un membre du staff
+  (token fourni par GET /_profiles/), pratique avec curl
+- Ou le paramètre ?profile=1 et les cookies d'un utilisateur is_staff
+- Ou elle est tirée au sort (PROFILING_SAMPLE_RATE, 0 par défaut)
+
+Le profil couvre tout ce qui est sous ce middleware : authentification
+(CookieJWTAuthentication), view, serializers, requêtes SQL. Il est écrit
+dans PROFILING_DIR (fichier .prof + métadonnées .json), consultable via
+/_profiles/ et ouvrable avec snakeviz ou pstats.
+
+Désactivé par défaut (PROFILING_ENABLED) : le middleware est alors retiré
+de la chaîne au démarrage et ne coûte rien.
+"""
+
+import cProfile
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_PARAM = 'profile'
+TOKEN_SALT = 'core.profiling'
+
+# Noms de fichiers générés par ce module (protège les views contre ../)
+PROFILE_NAME_PATTERN = re.compile(r'^[0-9]{8}-[0-9]{6}-[a-z0-9_-]+-[0-9a-f]{8}$')
+
+
+def make_token(user):
+    """Token signé autorisant un membre du staff à profiler via le header X-Profile."""
+    return signing.dumps({'user_id': str(user.pk)}, salt=TOKEN_SALT)
+
+
+def profiles_dir():
+    return Path(settings.PROFILING_DIR)
+
+
+def list_profiles():
+    """Métadonnées des profils enregistrés, du plus récent au plus ancien."""
+    profiles = []
+    for meta_path in sorted(profiles_dir().glob('*.json'), reverse=True):
+        try:
+            profiles.append(json.loads(meta_path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def profile_path(name):
+    """Chemin du fichier .prof d'un profil, ou None si le nom est invalide ou inconnu."""
+    if not PROFILE_NAME_PATTERN.match(name):
+        return None
+    path = profiles_dir() / f"{name}.prof"
+    return path if path.exists() else None
+
+
+class ProfilingMiddleware:
+    """
+    Middleware de profilage (voir la documentation du module).
+
+    Un seul profil à la fois par process : cProfile ne supporte pas deux
+    profileurs actifs simultanément, les autres requêtes passent sans profilage.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.token_max_age = getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+        self.max_files = getattr(settings, 'PROFILING_MAX_FILES', 200)
+        self._lock = threading.Lock()
+        profiles_dir().mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None or not self._lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            duration = time.perf_counter() - start
+        finally:
+            self._lock.release()
+
+        try:
+            name = self._save(profiler, request, response, duration, trigger)
+        except OSError:
+            logger.exception("Impossible d'enregistrer le profil", extra={'event': 'profiling.save_failed'})
+        else:
+            response['X-Profile-Id'] = name
+        return response
+
+    # =========================================================================
+    # Déclenchement
+    # =========================================================================
+
+    def _trigger(self, request):
+        """Raison du profilage ('header', 'query', 'sample') ou None."""
+        token = request.headers.get(PROFILE_HEADER)
+        if token and self._is_staff_token(token):
+            return 'header'
+
+        if request.GET.get(PROFILE_QUERY_PARAM) == '1' and self._is_staff_request(request):
+            return 'query'
+
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sample'
+
+        return None
+
+    def _is_staff_token(self, token):
+        try:
+            data = signing.loads(token, salt=TOKEN_SALT, max_age=self.token_max_age)
+        except signing.BadSignature:
+            return False
+        # Le statut staff est revérifié : un token ne survit pas à sa révocation
+        return get_user_model().objects.filter(pk=data['user_id'], is_staff=True, is_active=True).exists()
+
+    def _is_staff_request(self, request):
+        # L'authentification DRF n'a pas encore eu lieu : on lit le cookie JWT ici
+        from rest_framework.exceptions import AuthenticationFailed
+
+        from users.authentication import CookieJWTAuthentication
+
+        try:
+            result = CookieJWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return result is not None and result[0].is_staff
+
+    # =========================================================================
+    # Enregistrement
+    # =========================================================================
+
+    def _save(self, profiler, request, response, duration, trigger):
+        now = datetime.now(timezone.utc)
+        path_slug = slugify(request.path.replace('/', ' ')) or 'root'
+        name = f"{now:%Y%m%d-%H%M%S}-{request.method.lower()}-{path_slug[:60]}-{uuid.uuid4().hex[:8]}"
+
+        directory = profiles_dir()
+        profiler.dump_stats(directory / f"{name}.prof")
+        (directory / f"{name}.json").write_text(json.dumps({
+            'name': name,
+            'created_at': now.isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 1),
+            'trigger': trigger,
+            'request_id': getattr(request, 'request_id', None),
+        }))
+
+        logger.info(
+            "Requête profilée : %s %s", request.method, request.path,
+            extra={'event': 'profiling.saved', 'profile': name, 'duration_ms': round(duration * 1000, 1)},
+        )
+        self._rotate(directory)
+        return name
+
+    def _rotate(self, directory):
+        """Supprime les profils les plus anciens au-delà de PROFILING_MAX_FILES."""
+        for meta_path in sorted(directory.glob('*.json'), reverse=True)[self.max_files:]:
+            meta_path.with_suffix('.prof').unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
@@ -0,0 +1,140 @@
+"""
+Routage des lectures vers les réplicas PostgreSQL.
+
+- Écritures → toujours sur 'default' (primaire)
+- Lectures des apps listées dans REPLICA_ROUTED_APPS (users, auth) → un réplica
+  disponible, choisi au hasard parmi DATABASE_REPLICAS
+- Un réplica injoignable est écarté pendant REPLICA_RETRY_SECONDS : à la
+  connexion (bornée par DB_REPLICA_CONNECT_TIMEOUT), ou quand une requête HTTP
+  échoue sur une erreur de base et que sa connexion au réplica n'est plus
+  utilisable (PrimaryPinningMiddleware). Cette requête-là reçoit l'erreur,
+  les suivantes lisent sur les autres réplicas ou le primaire.
+
+Lecture de ses propres écritures :
+- Dès qu'une requête écrit, ses lectures suivantes vont sur le primaire
+- PrimaryPinningMiddleware pose alors un cookie qui épingle l'utilisateur
+  au primaire pendant REPLICA_PIN_SECONDS (le temps que les réplicas rattrapent)
+
+Hors requête HTTP (commandes, workers), tout reste sur le primaire.
+Sans réplica configuré, ce router ne change rien.
+"""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections, router
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'default'
+
+
+class RoutingState:
+    """État de routage de la requête en cours."""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned    # Lectures forcées sur le primaire
+        self.wrote = False      # La requête a écrit en base
+        self.replicas = set()   # Réplicas lus par la requête
+
+
+# None = hors requête HTTP → primaire
+routing_state_var = contextvars.ContextVar('routing_state', default=None)
+
+
+class ReplicaPool:
+    """Choisit un réplica joignable, en écartant temporairement ceux en erreur."""
+
+    def __init__(self, aliases, retry_after):
+        self.aliases = list(aliases)
+        self.retry_after = retry_after
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """Retourne l'alias d'un réplica joignable, ou None si aucun."""
+        now = time.monotonic()
+        candidates = [alias for alias in self.aliases if self._down_until.get(alias, 0) <= now]
+        random.shuffle(candidates)
+
+        for alias in candidates:
+            try:
+                # No-op si la connexion (persistante) est déjà ouverte
+                connections[alias].ensure_connection()
+            except DatabaseError:
+                self.mark_down(alias)
+                continue
+            return alias
+        return None
+
+    def mark_down(self, alias):
+        """Écarte un réplica pendant retry_after secondes."""
+        with self._lock:
+            self._down_until[alias] = time.monotonic() + self.retry_after
+        logger.warning(
+            "Réplica %s injoignable, écarté %ss", alias, self.retry_after,
+            extra={'event': 'db.replica_down', 'alias': alias},
+        )
+
+
+class ReplicaRouter:
+    """
+    Router Django (voir DATABASE_ROUTERS dans settings.py).
+    """
+
+    def __init__(self):
+        self.routed_apps = set(getattr(settings, 'REPLICA_ROUTED_APPS', ()))
+        self.pool = ReplicaPool(
+            getattr(settings, 'DATABASE_REPLICAS', ()),
+            getattr(settings, 'REPLICA_RETRY_SECONDS', 30),
+        )
+
+    def db_for_read(self, model, **hints):
+        if not self.pool.aliases or model._meta.app_label not in self.routed_apps:
+            return None
+
+        state = routing_state_var.get()
+        if state is None or state.pinned or state.wrote:
+            return PRIMARY
+
+        alias = self.pool.choose()
+        if alias is None:
+            return PRIMARY
+        state.replicas.add(alias)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = routing_state_var.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaire et réplicas contiennent les mêmes données
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+def mark_unusable_replicas_down(aliases):
+    """
+    Écarte ceux des réplicas dont la connexion n'est plus utilisable.
+
+    Appelé après une erreur de base pendant une requête : une erreur SQL sur un
+    réplica sain ne l'écarte pas, une connexion coupée en cours de requête si.
+    """
+    routers = [r for r in router.routers if isinstance(r, ReplicaRouter)]
+    for alias in aliases:
+        connection = connections[alias]
+        try:
+            usable = connection.connection is not None and connection.is_usable()
+        except DatabaseError:
+            usable = False
+        if not usable:
+            for replica_router in routers:
+                replica_router.pool.mark_down(alias)
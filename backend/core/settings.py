@@ -50,6 +50,7 @@ INSTALLED_APPS = [
     
     # Local apps
     'users',
+    'tasks',                                    # File de tâches (manage.py runworker)
     # Ajouter vos autres apps ici
 ]
 
@@ -60,6 +61,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # DOIT être en premier
+    'core.middleware.RequestIdMiddleware',    # X-Request-ID dans les logs
+    'core.profiling.ProfilingMiddleware',     # Profilage à la demande (si PROFILING_ENABLED)
+    'core.middleware.PrimaryPinningMiddleware',  # Lecture de ses écritures (réplicas)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -169,9 +173,60 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Connexions persistantes : évite une connexion par requête
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        # Base injoignable : échouer vite plutôt qu'attendre le timeout TCP
+        'OPTIONS': {'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5'))},
     }
 }
 
+# Réplicas en lecture (optionnel) : mêmes identifiants que le primaire
+# DB_REPLICA_HOSTS=replica1.example.com,replica2.example.com
+# → alias 'replica', 'replica_2', ...
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))):
+    _alias = 'replica' if _index == 0 else f'replica_{_index + 1}'
+    DATABASES[_alias] = {
+        **DATABASES['default'],
+        'HOST': _host.strip(),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        # Un réplica injoignable ne doit pas bloquer la requête longtemps
+        'OPTIONS': {'connect_timeout': int(os.getenv('DB_REPLICA_CONNECT_TIMEOUT', '2'))},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(_alias)
+
+# Les lectures des apps listées vont sur les réplicas, les écritures sur le primaire
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_ROUTED_APPS = ['users', 'auth']
+
+# Après une écriture, l'utilisateur lit sur le primaire pendant ce délai (secondes)
+REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', '10'))
+
+# Un réplica injoignable est écarté pendant ce délai (secondes)
+REPLICA_RETRY_SECONDS = int(os.getenv('DB_REPLICA_RETRY_SECONDS', '30'))
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+# Redis si REDIS_URL est défini (partagé entre workers), sinon cache mémoire local
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # =============================================================================
 # AUTHENTIFICATION
@@ -179,13 +234,158 @@ DATABASES = {
 
 AUTH_USER_MODEL = 'users.User'
 
+# Chemin relatif à BASE_DIR (ou absolu)
+COMMON_PASSWORDS_PATH = BASE_DIR / os.getenv('COMMON_PASSWORDS_PATH', 'data/passwords.bin')
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
-    {'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator'},
+    {
+        # Liste de mots de passe compilée et mappée en mémoire (partagée entre workers)
+        # Générer le fichier avec : python manage.py compile_passwords
+        'NAME': 'users.password_validation.CompiledPasswordValidator',
+        'OPTIONS': {'password_list_path': COMMON_PASSWORDS_PATH},
+    },
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# Hashers de mots de passe
+# Le premier de la liste est utilisé pour les nouveaux hashes, les autres
+# servent uniquement à vérifier les anciens (re-hashés au prochain login).
+# Choix de l'algorithme : pbkdf2_sha256 (défaut), argon2 (requiert argon2-cffi), scrypt
+_PASSWORD_HASHERS = {
+    'pbkdf2_sha256': 'users.hashers.PBKDF2PasswordHasher',
+    'argon2': 'users.hashers.Argon2PasswordHasher',
+    'scrypt': 'users.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2_sha256')
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    # Autres hashers par défaut de Django : les anciens hashes restent
+    # vérifiables et sont mis à niveau au prochain login
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Coût des hashers (vide = valeur par défaut de Django)
+# Calibrer pour la machine avec : python manage.py calibrate_hashers --target-ms 250
+PASSWORD_HASHER_PARAMS = {
+    'pbkdf2_sha256': {
+        'iterations': int(os.getenv('PASSWORD_PBKDF2_ITERATIONS') or 0),
+    },
+    'argon2': {
+        'time_cost': int(os.getenv('PASSWORD_ARGON2_TIME_COST') or 0),
+        'memory_cost': int(os.getenv('PASSWORD_ARGON2_MEMORY_COST') or 0),  # En KiB
+        'parallelism': int(os.getenv('PASSWORD_ARGON2_PARALLELISM') or 0),
+    },
+    'scrypt': {
+        'work_factor': int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR') or 0),
+        'block_size': int(os.getenv('PASSWORD_SCRYPT_BLOCK_SIZE') or 0),
+    },
+}
+
+
+# =============================================================================
+# SERVICES INTERNES
+# =============================================================================
+
+# Token partagé avec les autres backends (header X-Internal-Token)
+# Vide = endpoints internes désactivés
+INTERNAL_API_TOKEN = os.getenv('INTERNAL_API_TOKEN', '')
+
+# Nombre maximum d'utilisateurs par appel à /api/auth/internal/users/
+INTERNAL_BULK_MAX_IDS = int(os.getenv('INTERNAL_BULK_MAX_IDS', '500'))
+
+# Durée de cache d'un profil utilisateur (secondes), invalidé à chaque modification
+USER_PROFILE_CACHE_TTL = int(os.getenv('USER_PROFILE_CACHE_TTL', '300'))
+
+# Sans REDIS_URL, le cache est propre à chaque process : l'invalidation ne touche
+# que le worker qui a fait l'écriture. La durée de cache est alors plafonnée à
+# cette valeur, qui borne le retard des autres workers (voir users/cache.py)
+USER_PROFILE_LOCAL_CACHE_TTL = int(os.getenv('USER_PROFILE_LOCAL_CACHE_TTL', '5'))
+
+# Introspection des tokens : durée de cache max d'une réponse (secondes)
+# Une désactivation de compte est vue au plus tard après ce délai
+INTROSPECTION_CACHE_TTL = int(os.getenv('INTROSPECTION_CACHE_TTL', '30'))
+
+# Nombre maximum de tokens par appel à /api/auth/introspect/
+INTROSPECTION_MAX_TOKENS = int(os.getenv('INTROSPECTION_MAX_TOKENS', '100'))
+
+
+# =============================================================================
+# TÂCHES ET EMAILS
+# =============================================================================
+
+# True : les tâches sont exécutées directement après le commit, sans worker (tests, dev)
+TASKS_EAGER = os.getenv('TASKS_EAGER', 'False') == 'True'
+
+# Par défaut les emails sont affichés dans la console
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+
+
+# =============================================================================
+# PROFILAGE
+# =============================================================================
+# Profilage cProfile à la demande (voir core/profiling.py), consultable via /_profiles/
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_DIR = BASE_DIR / os.getenv('PROFILING_DIR', 'profiles')
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))  # Part des requêtes profilées au hasard
+PROFILING_TOKEN_MAX_AGE = 60 * 60      # Validité du token X-Profile (secondes)
+PROFILING_MAX_FILES = 200              # Au-delà, les profils les plus anciens sont supprimés
+
+
+# =============================================================================
+# LOGGING
+# =============================================================================
+# Logs JSON écrits par un thread dédié (voir core/log.py) :
+# le thread de la requête ne fait que déposer le log dans une file bornée
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'core.log.RequestIdFilter'},
+        'sampling': {
+            '()': 'core.log.SamplingFilter',
+            # Taux de conservation des événements à fort volume (0 à 1)
+            'rates': {
+                'auth.me': float(os.getenv('LOG_SAMPLE_RATE_ME', '0.01')),
+                'auth.refresh': float(os.getenv('LOG_SAMPLE_RATE_REFRESH', '0.1')),
+            },
+        },
+    },
+    'formatters': {
+        'json': {'()': 'core.log.JsonFormatter'},
+    },
+    'handlers': {
+        'queue': {
+            '()': 'core.log.QueueLogHandler',
+            'maxsize': int(os.getenv('LOG_QUEUE_SIZE', '10000')),  # Au-delà, les logs sont abandonnés
+            'formatter': 'json',
+            'filters': ['request_id', 'sampling'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': os.getenv('LOG_LEVEL', 'INFO'),
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queue'],
+            'level': os.getenv('DJANGO_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 
 # =============================================================================
 # INTERNATIONALISATION
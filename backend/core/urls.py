@@ -2,6 +2,9 @@
 URL configuration for core project.
 
 Routes principales :
+- /healthz/   → Sonde de vie (load balancer)
+- /readyz/    → Sonde de disponibilité (worker préchauffé)
+- /_profiles/ → Requêtes profilées (staff, si PROFILING_ENABLED)
 - /admin/     → Interface d'administration Django
 - /api/auth/  → Endpoints d'authentification (users app)
 - /api/       → Autres endpoints de l'API (à ajouter)
@@ -10,7 +13,13 @@ Routes principales :
 from django.contrib import admin
 from django.urls import include, path
 
+from .views import HealthView, ProfileDetailView, ProfileListView, ReadyView
+
 urlpatterns = [
+    path('healthz/', HealthView.as_view(), name='healthz'),
+    path('readyz/', ReadyView.as_view(), name='readyz'),
+    path('_profiles/', ProfileListView.as_view(), name='profiles'),
+    path('_profiles/<str:name>/', ProfileDetailView.as_view(), name='profile-detail'),
     path('admin/', admin.site.urls),
     path('api/auth/', include('users.urls', namespace='users')),
     # Ajouter vos autres apps ici :
@@ -0,0 +1,123 @@
+"""
+Views techniques du projet.
+
+- GET /healthz/           → Le process répond (liveness)
+- GET /readyz/            → Le worker est préchauffé et la base répond (readiness)
+- GET /_profiles/         → Liste des requêtes profilées (staff)
+- GET /_profiles/<name>/  → Détail d'un profil (staff)
+"""
+
+import io
+import pstats
+
+from django.db import DatabaseError
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import profiling, warmup
+
+
+class HealthView(APIView):
+    """
+    Sonde de vie : aucun accès à la base, aucune authentification.
+
+    GET /healthz/
+
+    Réponses :
+    - 200 : Le process répond
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response({'status': 'ok'})
+
+
+class ReadyView(APIView):
+    """
+    Sonde de disponibilité.
+
+    GET /readyz/
+
+    Si le préchauffage a échoué au démarrage (ex. base indisponible), il est
+    relancé en arrière-plan et la sonde répond 503 sans l'attendre.
+
+    Réponses :
+    - 200 : Worker préchauffé, base joignable
+    - 503 : Worker pas encore prêt ou base injoignable
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        if not warmup.is_ready():
+            warmup.retry_in_background()
+            return Response({'status': 'warming_up'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        try:
+            warmup.ping_database()
+        except DatabaseError:
+            return Response({'status': 'database_unavailable'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        return Response({'status': 'ready'})
+
+
+class ProfileListView(APIView):
+    """
+    Liste des requêtes profilées (voir core/profiling.py).
+
+    GET /_profiles/
+
+    Renvoie aussi un token pour profiler une requête via le header X-Profile :
+        curl -H "X-Profile: <token>" -X POST http://localhost:8000/api/auth/signin/ ...
+
+    Réponses :
+    - 200 : {"token": "...", "profiles": [{"name", "path", "duration_ms", ...}]}
+    - 401/403 : Non authentifié ou pas membre du staff
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'token': profiling.make_token(request.user),
+            'profiles': profiling.list_profiles(),
+        })
+
+
+class ProfileDetailView(APIView):
+    """
+    Détail d'un profil.
+
+    GET /_profiles/<name>/?sort=cumulative&limit=50
+    GET /_profiles/<name>/?download=1   → Fichier .prof (snakeviz, pstats)
+
+    Réponses :
+    - 200 : Statistiques pstats en texte
+    - 404 : Profil inconnu
+    """
+    permission_classes = [IsAdminUser]
+
+    SORT_KEYS = ('cumulative', 'tottime', 'ncalls', 'name')
+
+    def get(self, request, name):
+        path = profiling.profile_path(name)
+        if path is None:
+            return Response({'error': 'Profil introuvable'}, status=status.HTTP_404_NOT_FOUND)
+
+        if request.query_params.get('download') == '1':
+            return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
+
+        sort = request.query_params.get('sort', 'cumulative')
+        if sort not in self.SORT_KEYS:
+            sort = 'cumulative'
+        try:
+            limit = max(1, int(request.query_params.get('limit', 50)))
+        except ValueError:
+            limit = 50
+
+        stream = io.StringIO()
+        pstats.Stats(str(path), stream=stream).sort_stats(sort).print_stats(limit)
+        return Response({'name': name, 'sort': sort, 'stats': stream.getvalue()})
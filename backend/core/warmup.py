@@ -0,0 +1,150 @@
+"""
+Préchauffage des workers.
+
+Les premières requêtes d'un worker neuf paient les imports paresseux, la
+première connexion à la base, l'initialisation de simplejwt (backend, clé),
+la construction des champs des serializers et le chargement des validateurs
+de mots de passe : ce sont les pics de p99 à chaque déploiement.
+
+warm_up() exécute ces chemins au démarrage (appelé dans core/wsgi.py) et
+marque le worker comme prêt : /readyz/ ne répond 200 qu'ensuite, le load
+balancer n'envoie donc du trafic qu'aux workers préchauffés. Si le préchauffage
+a échoué, /readyz/ le relance dans un thread (retry_in_background) sans
+attendre : une sonde ne reste jamais bloquée sur une base injoignable.
+"""
+
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_retry_thread = None
+_retry_lock = threading.Lock()
+
+
+def is_ready():
+    """True si le préchauffage s'est terminé sans erreur."""
+    return _ready.is_set()
+
+
+def ping_database():
+    """Ouvre (ou réutilise) la connexion à la base et exécute un SELECT 1."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def _load_urls():
+    # Importe toutes les vues (et leurs dépendances) via le résolveur d'URLs
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+
+
+def _warm_authentication():
+    from django.contrib.auth import get_user_model
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from users.authentication import CookieJWTAuthentication
+
+    # Génère puis valide un vrai token : initialise le backend et la clé de
+    # signature, puis exerce la requête de chargement de l'utilisateur
+    user = get_user_model()(id=uuid.uuid4(), username='warmup')
+    authentication = CookieJWTAuthentication()
+    validated_token = authentication.get_validated_token(str(AccessToken.for_user(user)))
+    try:
+        authentication.get_user(validated_token)
+    except AuthenticationFailed:
+        pass  # Utilisateur inexistant : attendu
+
+
+def _warm_serializers():
+    from django.contrib.auth import get_user_model
+
+    from users.serializers import SignInSerializer, SignUpSerializer, UserSerializer
+
+    UserSerializer(get_user_model()(id=uuid.uuid4(), username='warmup')).data
+    SignUpSerializer().fields
+    SignInSerializer().fields
+
+
+def _warm_password_validators():
+    from django.contrib.auth.password_validation import validate_password
+    from django.core.exceptions import ValidationError
+
+    # Instancie les validateurs (liste compilée mappée avant le fork) et les exécute
+    try:
+        validate_password(secrets.token_urlsafe(16))
+    except ValidationError:
+        pass
+
+
+STEPS = (
+    ('database', ping_database),
+    ('urls', _load_urls),
+    ('authentication', _warm_authentication),
+    ('serializers', _warm_serializers),
+    ('password_validators', _warm_password_validators),
+)
+
+
+def warm_up():
+    """
+    Exécute toutes les étapes de préchauffage.
+
+    Une étape en échec est loggée sans interrompre les suivantes ; le worker
+    n'est marqué prêt que si toutes réussissent. Retourne True si prêt.
+    """
+    with _lock:
+        if _ready.is_set():
+            return True
+
+        failed = []
+        for name, step in STEPS:
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception:
+                failed.append(name)
+                logger.exception("Échec du préchauffage : %s", name, extra={'event': 'warmup.failed', 'step': name})
+                continue
+            logger.info(
+                "Préchauffage : %s", name,
+                extra={'event': 'warmup.step', 'step': name, 'duration_ms': round((time.perf_counter() - start) * 1000, 1)},
+            )
+
+        if not failed:
+            _ready.set()
+        return not failed
+
+
+def retry_in_background():
+    """Relance warm_up() dans un thread, un seul à la fois, sans bloquer l'appelant."""
+    global _retry_thread
+    with _retry_lock:
+        if _ready.is_set() or (_retry_thread is not None and _retry_thread.is_alive()):
+            return
+        _retry_thread = threading.Thread(target=_retry, name='warmup-retry', daemon=True)
+        _retry_thread.start()
+
+
+def _retry():
+    try:
+        warm_up()
+    finally:
+        # Connexions propres à ce thread : ne pas les laisser ouvertes
+        connections.close_all()
+
+
+# Avec un serveur qui charge l'application avant de forker (gunicorn --preload),
+# la connexion ouverte par le préchauffage ne doit pas être partagée par les
+# workers : on la ferme juste avant chaque fork
+os.register_at_fork(before=connections.close_all)
@@ -9,3 +9,16 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# Charger les validateurs de mots de passe avant le fork des workers
+# (gunicorn --preload) : la liste compilée est mappée une seule fois
+# et ses pages sont partagées par tous les process, préchauffage ou non
+from django.contrib.auth.password_validation import get_default_password_validators  # noqa: E402
+
+get_default_password_validators()
+
+# Préchauffer le worker avant de recevoir du trafic (voir core/warmup.py)
+if os.getenv('WARMUP_ON_BOOT', 'True') == 'True':
+    from core.warmup import warm_up  # noqa: E402
+
+    warm_up()
@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from tasks.models import Task
+
+# Register your models here.
+admin.site.register(Task)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TasksConfig(AppConfig):
+    name = 'tasks'
+
+    def ready(self):
+        # Enregistre les tâches déclarées dans les modules <app>/tasks.py
+        autodiscover_modules('tasks')
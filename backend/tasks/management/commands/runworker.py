@@ -0,0 +1,74 @@
+"""
+Worker de la file de tâches.
+
+Usage :
+    python manage.py runworker
+    python manage.py runworker --batch-size 20 --sleep 0.5
+    python manage.py runworker --once    # Vide la file puis s'arrête (tests, cron)
+
+Plusieurs workers peuvent tourner en parallèle (SKIP LOCKED).
+SIGTERM / Ctrl+C : le lot en cours est terminé avant l'arrêt.
+"""
+
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.worker import claim_batch, requeue_stale, run_task
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches en file (table tasks_task)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10,
+            help="Nombre de tâches réservées par requête (défaut : 10).",
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help="Attente en secondes quand la file est vide (défaut : 1).",
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=300,
+            help="Délai en secondes après lequel une tâche 'running' est remise en file (défaut : 300). "
+                 "Doit dépasser la durée de la plus longue tâche, sinon elle est exécutée deux fois.",
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="S'arrêter dès que la file est vide.",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.stdout.write(self.style.SUCCESS("Worker démarré"))
+        last_requeue = 0
+
+        while not self.stopping:
+            # Connexion longue durée : la renouveler si elle est trop vieille ou cassée
+            close_old_connections()
+
+            if time.monotonic() - last_requeue > options['stale_after']:
+                requeued = requeue_stale(options['stale_after'])
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f"{requeued} tâche(s) interrompue(s) remise(s) en file"))
+                last_requeue = time.monotonic()
+
+            tasks = claim_batch(options['batch_size'])
+            for t in tasks:
+                run_task(t)
+
+            if not tasks:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+
+        self.stdout.write("Worker arrêté")
+
+    def stop(self, signum, frame):
+        self.stopping = True
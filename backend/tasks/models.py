@@ -0,0 +1,61 @@
+"""
+Models pour l'application tasks.
+
+La file de tâches est une simple table PostgreSQL : une tâche est insérée
+dans la même transaction que les données qu'elle concerne (pas de tâche
+fantôme si la transaction est annulée), puis consommée par `manage.py runworker`
+avec SELECT ... FOR UPDATE SKIP LOCKED (plusieurs workers sans conflit).
+"""
+
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    Tâche en attente d'exécution.
+
+    Une tâche réussie est supprimée de la table (qui reste petite) ;
+    une tâche qui a épuisé ses tentatives reste en statut 'failed' pour analyse.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'En attente'
+        RUNNING = 'running', 'En cours'
+        FAILED = 'failed', 'Échouée'
+
+    name = models.CharField(max_length=255)
+
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+
+    attempts = models.PositiveIntegerField(default=0)
+
+    max_attempts = models.PositiveIntegerField(default=5)
+
+    # Date à partir de laquelle la tâche peut être exécutée (backoff des retries)
+    run_at = models.DateTimeField(default=timezone.now)
+
+    # Date de prise en charge par un worker (détection des workers morts)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Tâche"
+        verbose_name_plural = "Tâches"
+        ordering = ['run_at']
+        indexes = [
+            # Index partiel : seules les tâches en attente sont parcourues par les workers
+            models.Index(
+                fields=['run_at'],
+                condition=models.Q(status='pending'),
+                name='tasks_pending_run_at_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
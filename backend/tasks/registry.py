@@ -0,0 +1,127 @@
+"""
+Déclaration et mise en file des tâches.
+
+Déclarer une tâche (dans <app>/tasks.py, découvert automatiquement) :
+
+    from tasks.registry import task
+
+    @task(max_attempts=5)
+    def send_welcome_email(user_id):
+        ...
+
+La mettre en file depuis une vue, dans la transaction en cours :
+
+    with transaction.atomic():
+        user = serializer.save()
+        send_welcome_email.enqueue(user_id=str(user.pk))
+
+Les arguments sont stockés en JSON : passer des identifiants, pas des objets.
+Le nom de la tâche est positionnel et `delay` est réservé à la file : une
+tâche ne peut pas avoir de paramètre `delay` (refusé à la déclaration).
+"""
+
+import inspect
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+# Options de enqueue() : ne peuvent pas être des paramètres de tâche
+RESERVED_PARAMETERS = {'delay'}
+
+
+class TaskDefinition:
+    """Fonction enregistrée comme tâche."""
+
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        # Appel direct : exécution synchrone, sans passer par la file
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, /, *, delay=None, **kwargs):
+        return enqueue(self.name, delay=delay, **kwargs)
+
+
+def task(name=None, max_attempts=5):
+    """
+    Décorateur qui enregistre une fonction comme tâche.
+
+    Args:
+        name: Nom de la tâche (défaut : module.fonction)
+        max_attempts: Nombre d'exécutions avant abandon (statut 'failed')
+    """
+    def decorator(func):
+        reserved = RESERVED_PARAMETERS & set(inspect.signature(func).parameters)
+        if reserved:
+            raise TypeError(
+                f"La tâche {func.__qualname__} ne peut pas avoir de paramètre {', '.join(sorted(reserved))} "
+                f"(réservé à enqueue())"
+            )
+        definition = TaskDefinition(func, name or f"{func.__module__}.{func.__name__}", max_attempts)
+        _registry[definition.name] = definition
+        return definition
+    return decorator
+
+
+def get_task(name):
+    """Retourne la tâche enregistrée sous ce nom (KeyError si inconnue)."""
+    return _registry[name]
+
+
+def enqueue(name, /, *, delay=None, **kwargs):
+    """
+    Met une tâche en file.
+
+    L'insertion se fait dans la transaction en cours : la tâche n'est visible
+    par les workers qu'au commit, et disparaît si la transaction est annulée.
+
+    Avec TASKS_EAGER = True (tests, développement), la tâche est exécutée
+    directement après le commit, sans worker. Comme avec le worker, un échec
+    est journalisé sans remonter dans la requête qui a mis la tâche en file.
+
+    Args:
+        name: Nom de la tâche (positionnel : une tâche peut avoir un paramètre `name`)
+        delay: timedelta ou secondes avant la première exécution
+        **kwargs: Arguments de la tâche (sérialisables en JSON)
+
+    Returns:
+        Task: La ligne créée (None en mode eager)
+    """
+    definition = get_task(name)
+
+    if getattr(settings, 'TASKS_EAGER', False):
+        transaction.on_commit(lambda: _run_eager(definition, kwargs))
+        return None
+
+    if delay is not None and not isinstance(delay, timedelta):
+        delay = timedelta(seconds=delay)
+
+    return Task.objects.create(
+        name=definition.name,
+        payload=kwargs,
+        max_attempts=definition.max_attempts,
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+
+
+def _run_eager(definition, kwargs):
+    """Exécute une tâche en mode eager : une erreur est journalisée, pas propagée."""
+    try:
+        definition(**kwargs)
+    except Exception:
+        logger.exception(
+            "Tâche %s en échec (mode eager)", definition.name,
+            extra={'event': 'tasks.failed', 'task': definition.name},
+        )
@@ -0,0 +1,145 @@
+"""
+Exécution des tâches en file (utilisé par `manage.py runworker`).
+
+Chaque cycle :
+1. Récupère un lot de tâches prêtes avec SELECT ... FOR UPDATE SKIP LOCKED
+   et les marque 'running' (transaction courte : les verrous sont relâchés
+   avant l'exécution)
+2. Exécute chaque tâche hors transaction
+3. Succès → la ligne est supprimée
+   Échec → nouvel essai avec backoff exponentiel, ou 'failed' après max_attempts
+
+Les tâches restées 'running' plus de --stale-after secondes (worker tué) sont
+remises en file. Il n'y a pas de heartbeat : une tâche encore en cours après ce
+délai (SMTP lent...) est aussi remise en file et exécutée une seconde fois par
+un autre worker. L'exécution est donc « au moins une fois » : les tâches doivent
+être idempotentes, et --stale-after plus long que la plus longue d'entre elles.
+Le résultat n'est enregistré que par le worker qui détient encore la tâche
+(même locked_at que lors de sa réservation) : le premier exécutant, dépossédé,
+ne touche pas à la ligne reprise par un autre.
+"""
+
+import logging
+import random
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+# Backoff des retries : BACKOFF_BASE * 2^(tentative - 1), plafonné, avec jitter
+BACKOFF_BASE = 10        # secondes
+BACKOFF_MAX = 60 * 60    # 1 heure
+
+
+def backoff_delay(attempts):
+    """Délai avant la prochaine tentative, en secondes."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.75, 1.25)
+
+
+def claim_batch(batch_size):
+    """
+    Réserve jusqu'à batch_size tâches prêtes et les retourne.
+
+    SKIP LOCKED : les lignes déjà verrouillées par un autre worker sont
+    ignorées au lieu d'attendre, plusieurs workers se partagent la file.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=Task.Status.PENDING, run_at__lte=now)
+            .order_by('run_at')[:batch_size]
+        )
+        if tasks:
+            Task.objects.filter(pk__in=[t.pk for t in tasks]).update(
+                status=Task.Status.RUNNING,
+                locked_at=now,
+                attempts=F('attempts') + 1,
+            )
+    for t in tasks:
+        t.status = Task.Status.RUNNING
+        t.locked_at = now
+        t.attempts += 1
+    return tasks
+
+
+def owned(t):
+    """La ligne de la tâche, si ce worker la détient encore (pas remise en file entre-temps)."""
+    return Task.objects.filter(pk=t.pk, status=Task.Status.RUNNING, locked_at=t.locked_at)
+
+
+def run_task(t):
+    """Exécute une tâche réservée et enregistre son résultat."""
+    start = time.perf_counter()
+    try:
+        get_task(t.name)(**t.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if t.attempts >= t.max_attempts:
+            if not owned(t).update(status=Task.Status.FAILED, last_error=error):
+                return _lost(t)
+            logger.error(
+                "Tâche %s abandonnée après %d tentatives", t.name, t.attempts,
+                extra={'event': 'tasks.failed', 'task_id': t.pk, 'task': t.name},
+            )
+        else:
+            delay = backoff_delay(t.attempts)
+            if not owned(t).update(
+                status=Task.Status.PENDING,
+                run_at=timezone.now() + timedelta(seconds=delay),
+                locked_at=None,
+                last_error=error,
+            ):
+                return _lost(t)
+            logger.warning(
+                "Tâche %s en échec, nouvel essai dans %.0fs", t.name, delay,
+                extra={'event': 'tasks.retry', 'task_id': t.pk, 'task': t.name, 'attempts': t.attempts},
+            )
+        return False
+
+    if not owned(t).delete()[0]:
+        return _lost(t)
+    logger.info(
+        "Tâche %s exécutée", t.name,
+        extra={
+            'event': 'tasks.done', 'task_id': t.pk, 'task': t.name,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+        },
+    )
+    return True
+
+
+def _lost(t):
+    """La tâche a été remise en file pendant son exécution : son résultat est ignoré."""
+    logger.warning(
+        "Tâche %s remise en file pendant son exécution (plus longue que --stale-after ?)", t.name,
+        extra={'event': 'tasks.lost', 'task_id': t.pk, 'task': t.name},
+    )
+    return False
+
+
+def requeue_stale(timeout):
+    """
+    Remet en file les tâches 'running' depuis plus de timeout secondes
+    (worker tué en cours d'exécution, ou tâche plus longue que timeout : elle
+    sera exécutée une seconde fois). Retourne le nombre de tâches remises.
+    """
+    stale = Task.objects.filter(
+        status=Task.Status.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    # Tentatives épuisées : une tâche qui tue son worker ne boucle pas indéfiniment
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.Status.FAILED, last_error='Worker interrompu pendant l\'exécution',
+    )
+    return stale.update(status=Task.Status.PENDING, locked_at=None)
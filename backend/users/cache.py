@@ -0,0 +1,66 @@
+"""
+Cache des profils utilisateurs (UserSerializer) par identifiant.
+
+Utilisé par l'endpoint de résolution en masse des services internes :
+les profils déjà en cache sont lus en un seul get_many(), les autres
+en une seule requête id__in, puis mis en cache.
+
+Le cache est invalidé à chaque sauvegarde ou suppression d'un utilisateur
+(voir users/signals.py). L'invalidation n'est fiable qu'avec un cache partagé
+(REDIS_URL) : avec le cache mémoire local, chaque process a sa copie et seul
+le worker qui a fait l'écriture est invalidé. La durée de cache est alors
+plafonnée à USER_PROFILE_LOCAL_CACHE_TTL, qui borne le retard des autres workers.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .serializers import UserSerializer
+
+User = get_user_model()
+
+# À incrémenter si les champs de UserSerializer changent
+CACHE_VERSION = 1
+
+
+def profile_cache_key(user_id):
+    return f"users:profile:v{CACHE_VERSION}:{user_id}"
+
+
+def profile_cache_ttl():
+    """Durée de cache d'un profil, plafonnée si le cache n'est pas partagé entre process."""
+    if isinstance(caches['default'], LocMemCache):
+        return min(settings.USER_PROFILE_CACHE_TTL, settings.USER_PROFILE_LOCAL_CACHE_TTL)
+    return settings.USER_PROFILE_CACHE_TTL
+
+
+def get_profiles(user_ids):
+    """
+    Retourne {str(id): profil} pour les identifiants existants.
+
+    Args:
+        user_ids: Itérable d'UUID (ou de chaînes)
+    """
+    keys = {profile_cache_key(user_id): str(user_id) for user_id in user_ids}
+    cached = cache.get_many(keys)
+    profiles = {keys[key]: profile for key, profile in cached.items()}
+
+    missing = [user_id for key, user_id in keys.items() if key not in cached]
+    if missing:
+        # Lecture sur le primaire : un réplica en retard remettrait en cache
+        # un profil tout juste modifié (et invalidé)
+        users = list(User.objects.using('default').filter(id__in=missing))
+        fetched = {str(user.pk): data for user, data in zip(users, UserSerializer(users, many=True).data)}
+        cache.set_many(
+            {profile_cache_key(user_id): profile for user_id, profile in fetched.items()},
+            timeout=profile_cache_ttl(),
+        )
+        profiles.update(fetched)
+
+    return profiles
+
+
+def invalidate_profile(user_id):
+    cache.delete(profile_cache_key(user_id))
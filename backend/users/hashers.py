@@ -0,0 +1,58 @@
+"""
+Hashers de mots de passe paramétrables.
+
+Les hashers par défaut de Django ont un coût fixe (itérations PBKDF2,
+time_cost Argon2, work_factor scrypt) qui n'est calibré pour aucune machine.
+Ces sous-classes lisent leurs paramètres depuis settings.PASSWORD_HASHER_PARAMS,
+alimenté par les variables d'environnement (voir `manage.py calibrate_hashers`).
+
+Le nom d'algorithme est inchangé (pbkdf2_sha256, argon2, scrypt) : les hashes
+existants restent reconnus. Quand les paramètres changent, must_update()
+renvoie True et Django re-hashe le mot de passe au prochain login réussi
+(voir SignInView), sans migration de masse.
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _params(algorithm):
+    """Paramètres configurés pour un algorithme ({} si rien n'est défini)."""
+    params = getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(algorithm, {})
+    return {key: value for key, value in params.items() if value}
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 avec un nombre d'itérations configurable."""
+
+    iterations = _params('pbkdf2_sha256').get(
+        'iterations', hashers.PBKDF2PasswordHasher.iterations
+    )
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id avec time_cost / memory_cost (KiB) / parallelism configurables.
+
+    Nécessite le paquet argon2-cffi.
+    """
+
+    time_cost = _params('argon2').get('time_cost', hashers.Argon2PasswordHasher.time_cost)
+    memory_cost = _params('argon2').get('memory_cost', hashers.Argon2PasswordHasher.memory_cost)
+    parallelism = _params('argon2').get('parallelism', hashers.Argon2PasswordHasher.parallelism)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    scrypt avec work_factor (N) / block_size (r) configurables.
+
+    maxmem est dérivé des paramètres : la limite par défaut d'OpenSSL (32 Mo)
+    empêcherait sinon d'utiliser un work_factor supérieur à 2**14.
+    """
+
+    work_factor = _params('scrypt').get('work_factor', hashers.ScryptPasswordHasher.work_factor)
+    block_size = _params('scrypt').get('block_size', hashers.ScryptPasswordHasher.block_size)
+    parallelism = _params('scrypt').get('parallelism', hashers.ScryptPasswordHasher.parallelism)
+
+    # Mémoire utilisée par scrypt ≈ 128 * r * N (* p), avec une marge x2
+    maxmem = 2 * 128 * block_size * work_factor * parallelism
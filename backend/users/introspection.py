@@ -0,0 +1,133 @@
+"""
+Introspection des tokens JWT (RFC 7662) pour les serveurs de ressources.
+
+Pour chaque token :
+1. Signature et expiration vérifiées (comme CookieJWTAuthentication)
+2. jti absent de la blacklist (tokens révoqués au logout). Un access token est
+   aussi révoqué quand le refresh token dont il est issu est blacklisté
+   (claim REFRESH_JTI_CLAIM, voir users/tokens.py)
+3. Utilisateur existant et is_active
+
+Limites : un access token émis sans ce claim (avant son introduction) reste
+actif jusqu'à son exp (15 minutes au plus). Au logout, seuls les tokens des
+cookies de la requête sont retirés du cache : un autre access token de la
+même session déjà en cache reste actif au plus INTROSPECTION_CACHE_TTL.
+
+Les réponses sont mises en cache par empreinte SHA-256 du token, jusqu'à
+son expiration ou INTROSPECTION_CACHE_TTL (le plus court des deux). Pour
+plusieurs tokens, les absents du cache sont vérifiés avec une seule requête
+sur la blacklist et une seule requête sur les utilisateurs.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .tokens import REFRESH_JTI_CLAIM
+
+User = get_user_model()
+
+INACTIVE = {'active': False}
+
+# Claims du token repris dans la réponse
+EXPOSED_CLAIMS = ('token_type', 'exp', 'iat', 'jti')
+
+
+def introspection_cache_key(token):
+    return f"users:introspect:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def introspect_tokens(tokens):
+    """
+    Introspecte une liste de tokens.
+
+    Returns:
+        list: Une réponse RFC 7662 par token, dans le même ordre
+              ({'active': False} pour un token invalide, expiré ou révoqué)
+    """
+    keys = [introspection_cache_key(token) for token in tokens]
+    results = cache.get_many(keys)
+
+    missing = {key: token for key, token in zip(keys, tokens) if key not in results}
+    if missing:
+        fresh = _introspect_uncached(missing)
+        results.update(fresh)
+        _cache_results(fresh)
+
+    return [results[key] for key in keys]
+
+
+def invalidate_introspection(token):
+    """Retire un token du cache (ex. juste après l'avoir blacklisté)."""
+    cache.delete(introspection_cache_key(token))
+
+
+def _introspect_uncached(tokens_by_key):
+    """Vérifie des tokens absents du cache : {clé de cache: réponse}."""
+    user_id_claim = settings.SIMPLE_JWT['USER_ID_CLAIM']
+
+    payloads = {}
+    for key, token in tokens_by_key.items():
+        try:
+            payloads[key] = UntypedToken(token).payload
+        except TokenError:
+            continue  # Signature invalide, token expiré ou malformé
+
+    # Une requête pour la blacklist, une pour les utilisateurs (sur le primaire :
+    # une révocation ou une désactivation doit être vue immédiatement)
+    jtis = {payload.get(claim) for payload in payloads.values() for claim in ('jti', REFRESH_JTI_CLAIM)}
+    jtis.discard(None)
+    blacklisted = set(
+        BlacklistedToken.objects.using('default')
+        .filter(token__jti__in=jtis)
+        .values_list('token__jti', flat=True)
+    )
+    user_ids = {payload.get(user_id_claim) for payload in payloads.values()}
+    active_users = dict(
+        User.objects.using('default')
+        .filter(pk__in=user_ids, is_active=True)
+        .values_list('pk', 'username')
+    )
+    active_users = {str(pk): username for pk, username in active_users.items()}
+
+    results = {}
+    for key in tokens_by_key:
+        payload = payloads.get(key)
+        user_id = payload and str(payload.get(user_id_claim))
+        if (
+            payload is None
+            or payload.get('jti') in blacklisted
+            or payload.get(REFRESH_JTI_CLAIM) in blacklisted
+            or user_id not in active_users
+        ):
+            results[key] = INACTIVE
+            continue
+
+        response = {'active': True, 'sub': user_id, 'username': active_users[user_id]}
+        response.update((claim, payload[claim]) for claim in EXPOSED_CLAIMS if claim in payload)
+        response[user_id_claim] = user_id
+        results[key] = response
+    return results
+
+
+def _cache_results(results):
+    """Met en cache jusqu'à exp ou INTROSPECTION_CACHE_TTL, le plus court des deux."""
+    ttl = settings.INTROSPECTION_CACHE_TTL
+    now = time.time()
+
+    by_timeout = {}
+    for key, response in results.items():
+        timeout = ttl
+        if response['active']:
+            timeout = min(ttl, int(response.get('exp', now) - now))
+        if timeout > 0:
+            by_timeout.setdefault(timeout, {})[key] = response
+
+    for timeout, entries in by_timeout.items():
+        cache.set_many(entries, timeout=timeout)
@@ -0,0 +1,246 @@
+"""
+Calibre le coût des hashers de mots de passe pour la machine courante.
+
+Le temps de réponse de /signin/ est essentiellement le temps d'un hash :
+cette commande mesure chaque algorithme et cherche les paramètres dont
+le coût se rapproche le plus du budget demandé (sans le dépasser).
+
+Usage :
+    python manage.py calibrate_hashers --target-ms 250
+    python manage.py calibrate_hashers --algorithm argon2 --write
+
+Avec --write, les valeurs sont écrites dans le fichier .env. Les utilisateurs
+existants sont re-hashés au prochain login (voir users/hashers.py).
+
+Les recommandations ne descendent jamais sous les coûts par défaut de Django :
+sinon chaque login affaiblirait le hash de l'utilisateur. Si la machine ne
+tient pas le budget avec ces coûts, augmenter le budget (ou, en connaissance
+de cause, passer --allow-below-default).
+"""
+
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import hashers as django_hashers
+from django.core.management.base import BaseCommand, CommandError
+
+from users.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+
+ALGORITHMS = ('pbkdf2_sha256', 'argon2', 'scrypt')
+
+# Bornes de recherche
+PBKDF2_PROBE_ITERATIONS = 100_000
+ARGON2_MIN_MEMORY_COST = 19_456      # 19 Mio, minimum recommandé par l'OWASP
+ARGON2_MAX_TIME_COST = 32
+SCRYPT_MAX_WORK_FACTOR = 2 ** 20     # 1 Gio de mémoire avec r=8
+
+
+class Command(BaseCommand):
+    help = "Mesure les hashers de mots de passe et recommande un coût pour un budget en millisecondes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target-ms', type=float, default=250,
+            help="Budget de temps par hash en millisecondes (défaut : 250).",
+        )
+        parser.add_argument(
+            '--algorithm', choices=ALGORITHMS, action='append',
+            help="Algorithme à calibrer (répétable). Par défaut : tous.",
+        )
+        parser.add_argument(
+            '--argon2-memory-cost', type=int,
+            default=django_hashers.Argon2PasswordHasher.memory_cost,
+            help="Mémoire Argon2 en KiB (défaut : %(default)s).",
+        )
+        parser.add_argument(
+            '--rounds', type=int, default=3,
+            help="Nombre de mesures par configuration, on garde la médiane (défaut : 3).",
+        )
+        parser.add_argument(
+            '--allow-below-default', action='store_true',
+            help="Autorise des coûts inférieurs aux valeurs par défaut de Django (déconseillé).",
+        )
+        parser.add_argument(
+            '--write', nargs='?', const=str(settings.BASE_DIR / '.env'), default=None,
+            metavar='ENV_FILE',
+            help="Écrit les valeurs dans le fichier .env (défaut : BASE_DIR/.env).",
+        )
+
+    def handle(self, *args, **options):
+        if options['target_ms'] <= 0:
+            raise CommandError("--target-ms doit être positif.")
+
+        self.target = options['target_ms'] / 1000
+        self.rounds = max(1, options['rounds'])
+        self.allow_below_default = options['allow_below_default']
+
+        calibrators = {
+            'pbkdf2_sha256': self.calibrate_pbkdf2,
+            'argon2': lambda: self.calibrate_argon2(options['argon2_memory_cost']),
+            'scrypt': self.calibrate_scrypt,
+        }
+
+        values = {}
+        for algorithm in options['algorithm'] or ALGORITHMS:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{algorithm} :"))
+            try:
+                result = calibrators[algorithm]()
+            except ValueError as e:
+                # Librairie manquante (ex. argon2-cffi non installé)
+                self.stdout.write(self.style.WARNING(f"  ignoré : {e}"))
+                continue
+            values.update(result)
+
+        if not values:
+            raise CommandError("Aucun algorithme n'a pu être calibré.")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Variables d'environnement recommandées :"))
+        for key, value in values.items():
+            self.stdout.write(f"  {key}={value}")
+
+        if options['write']:
+            write_env(options['write'], values)
+            self.stdout.write(self.style.SUCCESS(f"Valeurs écrites dans {options['write']}"))
+
+    # =========================================================================
+    # Mesure
+    # =========================================================================
+
+    def measure(self, hasher):
+        """Temps médian (en secondes) d'un encode() avec ce hasher."""
+        salt = hasher.salt()
+        timings = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            hasher.encode('calibration-password', salt)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    def report(self, params, elapsed):
+        description = ', '.join(f"{key}={value}" for key, value in params.items())
+        self.stdout.write(f"  {description} → {elapsed * 1000:.0f} ms")
+
+    def floor(self, name, value, default):
+        """Ramène un paramètre au coût par défaut de Django s'il est inférieur."""
+        if value >= default:
+            return value
+        if self.allow_below_default:
+            self.stdout.write(self.style.WARNING(f"  {name}={value} inférieur à la valeur par défaut de Django ({default})."))
+            return value
+        self.stdout.write(self.style.WARNING(
+            f"  {name}={value} inférieur à la valeur par défaut de Django : ramené à {default} "
+            f"(budget dépassé, augmenter --target-ms)."
+        ))
+        return default
+
+    # =========================================================================
+    # Calibration par algorithme
+    # =========================================================================
+
+    def calibrate_pbkdf2(self):
+        """Le coût de PBKDF2 est linéaire en nombre d'itérations : on extrapole."""
+        hasher = PBKDF2PasswordHasher()
+        hasher.iterations = PBKDF2_PROBE_ITERATIONS
+        elapsed = self.measure(hasher)
+
+        # Extrapolation puis vérification, arrondi à 10 000 près
+        iterations = int(PBKDF2_PROBE_ITERATIONS * self.target / elapsed)
+        iterations = max(10_000, iterations // 10_000 * 10_000)
+        iterations = self.floor('iterations', iterations, django_hashers.PBKDF2PasswordHasher.iterations)
+        hasher.iterations = iterations
+        self.report({'iterations': iterations}, self.measure(hasher))
+
+        return {'PASSWORD_PBKDF2_ITERATIONS': iterations}
+
+    def calibrate_argon2(self, memory_cost):
+        """
+        Mémoire fixée, on augmente time_cost tant que le budget est respecté.
+        Si time_cost=1 dépasse déjà le budget, on réduit la mémoire
+        (seulement avec --allow-below-default si on passe sous le défaut de Django).
+        """
+        hasher = Argon2PasswordHasher()
+        hasher._load_library()  # ValueError si argon2-cffi est absent
+        hasher.memory_cost = memory_cost
+        hasher.time_cost = 1
+
+        min_memory_cost = ARGON2_MIN_MEMORY_COST
+        if not self.allow_below_default:
+            min_memory_cost = max(min_memory_cost, django_hashers.Argon2PasswordHasher.memory_cost)
+
+        elapsed = self.measure(hasher)
+        while elapsed > self.target and hasher.memory_cost // 2 >= min_memory_cost:
+            hasher.memory_cost //= 2
+            elapsed = self.measure(hasher)
+
+        while hasher.time_cost < ARGON2_MAX_TIME_COST:
+            hasher.time_cost += 1
+            candidate = self.measure(hasher)
+            if candidate > self.target:
+                hasher.time_cost -= 1
+                break
+            elapsed = candidate
+
+        hasher.time_cost = self.floor('time_cost', hasher.time_cost, django_hashers.Argon2PasswordHasher.time_cost)
+        hasher.memory_cost = self.floor('memory_cost', hasher.memory_cost, django_hashers.Argon2PasswordHasher.memory_cost)
+        elapsed = self.measure(hasher)
+
+        params = {
+            'time_cost': hasher.time_cost,
+            'memory_cost': hasher.memory_cost,
+            'parallelism': hasher.parallelism,
+        }
+        self.report(params, elapsed)
+        if elapsed > self.target:
+            self.stdout.write(self.style.WARNING("  coût minimal supérieur au budget."))
+
+        return {
+            'PASSWORD_ARGON2_TIME_COST': hasher.time_cost,
+            'PASSWORD_ARGON2_MEMORY_COST': hasher.memory_cost,
+            'PASSWORD_ARGON2_PARALLELISM': hasher.parallelism,
+        }
+
+    def calibrate_scrypt(self):
+        """work_factor doit être une puissance de 2 : on double tant que le budget est respecté."""
+        hasher = ScryptPasswordHasher()
+        hasher.work_factor = django_hashers.ScryptPasswordHasher.work_factor
+        hasher.maxmem = 2 * 128 * hasher.block_size * hasher.work_factor * hasher.parallelism
+        elapsed = self.measure(hasher)
+
+        while hasher.work_factor < SCRYPT_MAX_WORK_FACTOR:
+            hasher.work_factor *= 2
+            hasher.maxmem *= 2
+            candidate = self.measure(hasher)
+            if candidate > self.target:
+                hasher.work_factor //= 2
+                hasher.maxmem //= 2
+                break
+            elapsed = candidate
+
+        self.report({'work_factor': hasher.work_factor, 'block_size': hasher.block_size}, elapsed)
+        if elapsed > self.target:
+            self.stdout.write(self.style.WARNING("  coût par défaut de Django supérieur au budget."))
+
+        return {
+            'PASSWORD_SCRYPT_WORK_FACTOR': hasher.work_factor,
+            'PASSWORD_SCRYPT_BLOCK_SIZE': hasher.block_size,
+        }
+
+
+def write_env(path, values):
+    """Met à jour (ou ajoute) les variables dans un fichier .env."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        lines = []
+
+    remaining = dict(values)
+    for index, line in enumerate(lines):
+        key = line.split('=', 1)[0].strip()
+        if key in remaining:
+            lines[index] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
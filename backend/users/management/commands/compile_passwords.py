@@ -0,0 +1,117 @@
+"""
+Compile des listes de mots de passe pour CompiledPasswordValidator.
+
+Usage :
+    # Liste de Django (20 000 mots de passe courants)
+    python manage.py compile_passwords
+
+    # Ajouter une liste de mots de passe en clair (un par ligne, .gz accepté)
+    python manage.py compile_passwords --source django --source rockyou.txt.gz
+
+    # Liste Have I Been Pwned (SHA-1 hexadécimaux, déjà triés)
+    python manage.py compile_passwords --source django --source pwned-passwords-sha1.txt --sorted
+
+Les listes déjà triées (--sorted) sont lues en flux : le coût mémoire de la
+compilation ne dépend alors pas de leur taille.
+"""
+
+import gzip
+import heapq
+import itertools
+import os
+import string
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import password_validation
+from django.core.management.base import BaseCommand, CommandError
+
+from users.password_validation import password_digest, sha1_hex_digest, write_password_set
+
+HEX_DIGITS = set(string.hexdigits)
+
+# Liste intégrée à Django (CommonPasswordValidator.DEFAULT_PASSWORD_LIST_PATH
+# est une cached_property depuis Django 5 : inutilisable sur la classe)
+DJANGO_PASSWORD_LIST_PATH = Path(password_validation.__file__).parent / 'common-passwords.txt.gz'
+
+
+class Command(BaseCommand):
+    help = "Compile des listes de mots de passe en un fichier trié et mappable en mémoire."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', action='append',
+            help="Fichier source (répétable). 'django' = liste intégrée à Django (défaut).",
+        )
+        parser.add_argument(
+            '--sorted', action='store_true',
+            help="Les sources SHA-1 sont déjà triées : lecture en flux, sans tout charger.",
+        )
+        parser.add_argument(
+            '--output', default=str(settings.COMMON_PASSWORDS_PATH),
+            help="Fichier de sortie (défaut : settings.COMMON_PASSWORDS_PATH).",
+        )
+
+    def handle(self, *args, **options):
+        sources = options['source'] or ['django']
+        streams = [self.read_source(source, options['sorted']) for source in sources]
+
+        output = options['output']
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+        # Écriture dans un fichier temporaire puis remplacement atomique :
+        # les workers qui ont déjà mappé l'ancien fichier ne sont pas affectés
+        tmp_output = f"{output}.tmp"
+        try:
+            count = write_password_set(tmp_output, heapq.merge(*streams))
+        except ValueError as e:
+            # Seule erreur de write_password_set : source --sorted pas triée
+            os.remove(tmp_output)
+            raise CommandError(f"{e} Retirer --sorted ou trier la source.")
+        except CommandError:
+            # Ligne invalide dans une source lue en flux (voir sha1_digest)
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+            raise
+        os.replace(tmp_output, output)
+
+        size = os.path.getsize(output) / 1024 / 1024
+        self.stdout.write(self.style.SUCCESS(f"{count} mots de passe compilés dans {output} ({size:.1f} Mo)"))
+
+    def read_source(self, source, presorted):
+        """Retourne un itérable trié des empreintes d'une source."""
+        path = DJANGO_PASSWORD_LIST_PATH if source == 'django' else source
+        if not os.path.exists(path):
+            raise CommandError(f"Fichier introuvable : {path}")
+
+        lines = enumerate(self.read_lines(path), start=1)
+        first = next(lines, (1, ''))
+        lines = itertools.chain([first], lines)
+
+        if is_sha1_line(first[1]):
+            digests = (self.sha1_digest(path, number, line) for number, line in lines if line)
+            if presorted:
+                return digests
+        else:
+            # Mots de passe en clair : normalisés comme le fait Django
+            digests = (password_digest(line.lower().strip()) for _, line in lines if line.strip())
+
+        return sorted(set(digests))
+
+    def sha1_digest(self, path, number, line):
+        """Empreinte d'une ligne SHA-1, ou CommandError qui désigne la ligne invalide."""
+        if not is_sha1_line(line):
+            raise CommandError(f"{path}, ligne {number} : empreinte SHA-1 invalide ({line[:50]!r}).")
+        return sha1_hex_digest(line)
+
+    def read_lines(self, path):
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                yield line.rstrip('\r\n')
+
+
+def is_sha1_line(line):
+    """Détecte le format HIBP : 'HEX40' ou 'HEX40:compteur'."""
+    sha1 = line.split(':', 1)[0]
+    return len(sha1) == 40 and set(sha1) <= HEX_DIGITS
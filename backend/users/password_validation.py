@@ -0,0 +1,144 @@
+"""
+Validation des mots de passe contre une liste compilée et mappée en mémoire.
+
+Le CommonPasswordValidator de Django décompresse et parse une liste gzip de
+20 000 mots de passe au premier appel, dans chaque worker : pic de latence au
+premier signup après chaque déploiement, et un set Python dupliqué par process.
+
+Ici la liste est précompilée (`manage.py compile_passwords`) en un tableau trié
+d'empreintes de 8 octets, lu via mmap et interrogé par recherche dichotomique :
+- Aucun parsing au démarrage, seulement un open() + mmap()
+- Les pages du fichier sont partagées entre tous les workers (page cache)
+- Une liste de plusieurs millions d'entrées (ex. Have I Been Pwned) ne coûte
+  pas de mémoire par process, seulement ~log2(n) lectures par vérification
+
+Format du fichier :
+    MAGIC (8 octets) | nombre d'entrées (uint64 big-endian) | empreintes triées
+"""
+
+import hashlib
+import logging
+import mmap
+import struct
+
+from django.contrib.auth.password_validation import CommonPasswordValidator
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext as _
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PWDSET\x00\x01'
+HEADER = struct.Struct('>8sQ')
+DIGEST_SIZE = 8
+
+
+def password_digest(password):
+    """Empreinte d'un mot de passe en clair (8 premiers octets du SHA-1)."""
+    return hashlib.sha1(password.encode('utf-8')).digest()[:DIGEST_SIZE]
+
+
+def sha1_hex_digest(sha1_hex):
+    """Empreinte à partir d'un SHA-1 hexadécimal (format des listes HIBP)."""
+    return bytes.fromhex(sha1_hex[:DIGEST_SIZE * 2])
+
+
+class CompiledPasswordSet:
+    """Ensemble trié d'empreintes, lu depuis un fichier mappé en mémoire."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or len(self._mmap) != HEADER.size + self._count * DIGEST_SIZE:
+            self._mmap.close()
+            raise ValueError(f"{path} n'est pas une liste compilée valide.")
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, digest):
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * DIGEST_SIZE
+            current = self._mmap[offset:offset + DIGEST_SIZE]
+            if current < digest:
+                low = middle + 1
+            elif current > digest:
+                high = middle
+            else:
+                return True
+        return False
+
+
+def write_password_set(path, digests):
+    """
+    Écrit un fichier compilé à partir d'un itérable d'empreintes TRIÉES.
+
+    Les doublons consécutifs sont ignorés. Retourne le nombre d'entrées écrites.
+    """
+    count = 0
+    previous = None
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 0))
+        for digest in digests:
+            if previous is not None and digest < previous:
+                raise ValueError("Les empreintes doivent être triées.")
+            if digest != previous:
+                f.write(digest)
+                count += 1
+                previous = digest
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, count))
+    return count
+
+
+class CompiledPasswordValidator:
+    """
+    Refuse les mots de passe présents dans une liste compilée.
+
+    Remplace CommonPasswordValidator dans AUTH_PASSWORD_VALIDATORS :
+        {
+            'NAME': 'users.password_validation.CompiledPasswordValidator',
+            'OPTIONS': {'password_list_path': BASE_DIR / 'data' / 'passwords.bin'},
+        }
+
+    Deux empreintes sont testées : celle du mot de passe normalisé
+    (minuscules, sans espaces, comme la liste de Django) et celle du mot de
+    passe brut (comme les listes SHA-1 de Have I Been Pwned).
+
+    Si le fichier compilé n'existe pas encore, on se rabat sur le
+    CommonPasswordValidator de Django pour ne jamais désactiver la vérification.
+    """
+
+    def __init__(self, password_list_path):
+        self.password_list_path = password_list_path
+        try:
+            self.passwords = CompiledPasswordSet(password_list_path)
+            self.fallback = None
+        except FileNotFoundError:
+            logger.warning(
+                "Liste compilée %s introuvable, utilisation de CommonPasswordValidator. "
+                "Lancer : python manage.py compile_passwords",
+                password_list_path,
+            )
+            self.passwords = None
+            self.fallback = CommonPasswordValidator()
+
+    def validate(self, password, user=None):
+        if self.fallback is not None:
+            return self.fallback.validate(password, user)
+
+        normalized = password.lower().strip()
+        if password_digest(normalized) in self.passwords or password_digest(password) in self.passwords:
+            raise ValidationError(
+                self.get_error_message(),
+                code='password_too_common',
+            )
+
+    def get_error_message(self):
+        return _("This password is too common.")
+
+    def get_help_text(self):
+        return _("Your password can’t be a commonly used password.")
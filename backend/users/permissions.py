@@ -0,0 +1,26 @@
+"""
+Permissions pour l'application users.
+"""
+
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+INTERNAL_TOKEN_HEADER = 'X-Internal-Token'
+
+
+class IsInternalService(BasePermission):
+    """
+    Autorise uniquement les services internes (autres backends).
+
+    Ils s'authentifient avec le header X-Internal-Token, comparé à
+    INTERNAL_API_TOKEN. Si ce setting est vide, tout est refusé.
+    """
+
+    message = 'Token de service interne invalide.'
+
+    def has_permission(self, request, view):
+        expected = getattr(settings, 'INTERNAL_API_TOKEN', '')
+        provided = request.headers.get(INTERNAL_TOKEN_HEADER, '')
+        return bool(expected) and hmac.compare_digest(provided.encode(), expected.encode())
@@ -7,12 +7,19 @@ Les serializers transforment les données entre :
 Ils gèrent aussi la validation des données entrantes.
 """
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from .usernames import next_username, username_stem
+
 User = get_user_model()
 
+# Nombre de tentatives de création en cas de conflit sur le username automatique
+USERNAME_MAX_ATTEMPTS = 5
+
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -36,6 +43,8 @@ class SignUpSerializer(serializers.ModelSerializer):
     """
     Serializer pour l'inscription d'un nouvel utilisateur.
     
+    Le username est optionnel : s'il est omis, il est généré automatiquement.
+    
     Exemple de données :
     {
         "username": "boussa",
@@ -63,6 +72,10 @@ class SignUpSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('username', 'first_name', 'last_name', 'email', 'password', 'password2')
+        extra_kwargs = {
+            # Optionnel : généré automatiquement s'il est absent ou vide
+            'username': {'required': False, 'allow_blank': True},
+        }
     
     def validate_email(self, value):
         """Vérifie que l'email n'est pas déjà utilisé."""
@@ -80,34 +93,51 @@ class SignUpSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """
-        Pour créer un nouvel utilisateur avec un nom d'utilisateur automatique.
-            validated_data.pop('password2')
-            # Générer le username à partir du prénom et nom
-            first_name = validated_data['first_name'].lower()
-            last_name = validated_data['last_name'].lower()
-            base_username = f"{last_name[:4]}{first_name[:2]}"
-            Exemple : Salim Bouskine -> boussa
-
-            # Gérer les doublons (boussa, boussa1, boussa2...)
-            username = base_username
-            counter = 1
-            while User.objects.filter(username=username).exists():
-                username = f"{base_username}{counter}"
-                counter += 1
-
-            validated_data['username'] = username
-            return User.objects.create_user(**validated_data)
-
         Crée un nouvel utilisateur.
         
+        Si aucun username n'est fourni, il est généré à partir du nom et du
+        prénom (Salim Bouskine → boussa, boussa1...), voir users/usernames.py.
+        
         Utilise create_user() qui :
         - Hash le mot de passe automatiquement
         - Normalise l'email
         """
         validated_data.pop('password2')  # On retire password2, pas besoin pour la création
+        username = validated_data.pop('username', '')
+        
+        if username:
+            user = self._create_user(username, validated_data)
+            if user is None:
+                raise serializers.ValidationError({'username': "Ce nom d'utilisateur est déjà pris."})
+            return user
+        
+        # Username automatique : pas de vérification préalable, on tente la
+        # création et on recalcule le suffixe si une inscription concurrente
+        # a pris le même username entre-temps
+        stem = username_stem(validated_data['first_name'], validated_data['last_name'])
+        for _ in range(USERNAME_MAX_ATTEMPTS):
+            user = self._create_user(next_username(stem), validated_data)
+            if user is not None:
+                return user
+        
+        raise serializers.ValidationError({'username': "Impossible de générer un nom d'utilisateur, réessayez."})
+    
+    def _create_user(self, username, validated_data):
+        """
+        Crée l'utilisateur, ou retourne None si le username est déjà pris.
         
-        user = User.objects.create_user(**validated_data)
-        return user
+        La contrainte unique de la base fait foi : un savepoint permet de
+        récupérer l'IntegrityError sans casser une transaction englobante.
+        """
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(username=username, **validated_data)
+        except IntegrityError:
+            if User.objects.filter(username=username).exists():
+                return None
+            if User.objects.filter(email=validated_data['email']).exists():
+                raise serializers.ValidationError({'email': 'Cette adresse email est déjà utilisée.'})
+            raise
 
 
 class SignInSerializer(serializers.Serializer):
@@ -127,3 +157,52 @@ class SignInSerializer(serializers.Serializer):
     username = serializers.CharField(max_length=100,required=True,)
     
     password = serializers.CharField(required=True,write_only=True,style={'input_type': 'password'},)
+
+
+class BulkUserLookupSerializer(serializers.Serializer):
+    """
+    Serializer pour la résolution d'utilisateurs en masse (services internes).
+    
+    Exemple de données :
+    {
+        "ids": ["3f1c...", "9a2b..."],
+        "fields": ["first_name", "last_name"]   (optionnel, défaut : tous)
+    }
+    """
+    
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.INTERNAL_BULK_MAX_IDS,
+    )
+    
+    fields = serializers.MultipleChoiceField(choices=UserSerializer.Meta.fields, required=False)
+
+
+class IntrospectionSerializer(serializers.Serializer):
+    """
+    Serializer pour l'introspection de tokens (RFC 7662).
+    
+    Un seul token (format RFC, JSON ou formulaire) :
+        token=eyJ...&token_type_hint=access_token
+    
+    Ou plusieurs en un appel :
+        {"tokens": ["eyJ...", "eyJ..."]}
+    """
+    
+    token = serializers.CharField(required=False)
+    
+    token_type_hint = serializers.CharField(required=False)  # Accepté, ignoré (le type est dans le token)
+    
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        allow_empty=False,
+        max_length=settings.INTROSPECTION_MAX_TOKENS,
+    )
+    
+    def validate(self, data):
+        """Vérifie qu'on a soit 'token', soit 'tokens'."""
+        if ('token' in data) == ('tokens' in data):
+            raise serializers.ValidationError("Fournir soit 'token', soit 'tokens'.")
+        return data
@@ -0,0 +1,18 @@
+"""
+Signaux de l'application users (connectés dans UsersConfig.ready()).
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_profile
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """Retire le profil du cache dès que l'utilisateur est modifié ou supprimé."""
+    invalidate_profile(instance.pk)
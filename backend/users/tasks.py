@@ -0,0 +1,25 @@
+"""
+Tâches asynchrones de l'application users (exécutées par `manage.py runworker`).
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+
+from tasks.registry import task
+
+User = get_user_model()
+
+
+@task(max_attempts=5)
+def send_welcome_email(user_id):
+    """Envoie l'email de bienvenue après l'inscription."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return  # Compte supprimé entre-temps
+
+    send_mail(
+        subject="Bienvenue !",
+        message=f"Bonjour {user.first_name},\n\nVotre compte {user.username} a bien été créé.",
+        from_email=None,  # DEFAULT_FROM_EMAIL
+        recipient_list=[user.email],
+    )
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .usernames import MAX_SUFFIX_DIGITS, next_username
+
+User = get_user_model()
+
+
+class NextUsernameTests(TestCase):
+    def create_user(self, username):
+        return User.objects.create_user(username=username, email=f"{username}@example.com", password='x')
+
+    def test_stem_then_counter(self):
+        self.assertEqual(next_username('dupoje'), 'dupoje')
+        self.create_user('dupoje')
+        self.assertEqual(next_username('dupoje'), 'dupoje1')
+        self.create_user('dupoje7')
+        self.assertEqual(next_username('dupoje'), 'dupoje8')
+
+    def test_saturated_counter_falls_back_to_random_suffix(self):
+        self.create_user('dupoje')
+        self.create_user('dupoje' + '9' * MAX_SUFFIX_DIGITS)
+
+        username = next_username('dupoje')
+        suffix = username[len('dupoje'):]
+        self.assertTrue(suffix.isdigit())
+        self.assertEqual(len(suffix), MAX_SUFFIX_DIGITS)
+        self.assertFalse(User.objects.filter(username=username).exists())
+
+
+class SignUpUsernameTests(TestCase):
+    def signup(self, email, username=''):
+        return APIClient().post('/api/auth/signup/', {
+            'username': username,
+            'first_name': 'Jean',
+            'last_name': 'Dupont',
+            'email': email,
+            'password': 'MotDePasse123!',
+            'password2': 'MotDePasse123!',
+        }, format='json')
+
+    def test_signups_after_manual_max_suffix(self):
+        # Régression : dupoje999999999 choisi à la main bloquait les inscriptions suivantes
+        self.assertEqual(self.signup('manual@example.com', 'dupoje' + '9' * MAX_SUFFIX_DIGITS).status_code, 201)
+        for index in range(5):
+            response = self.signup(f"auto{index}@example.com")
+            self.assertEqual(response.status_code, 201, response.content)
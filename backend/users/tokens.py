@@ -0,0 +1,24 @@
+"""
+Tokens JWT liés à une session.
+
+Un access token ne passe pas par la blacklist de simplejwt (seuls les refresh
+tokens y sont enregistrés). Pour qu'il soit révoqué au logout, chaque access
+token porte le jti du refresh token dont il est issu (claim REFRESH_JTI_CLAIM) :
+l'introspection le considère révoqué dès que ce refresh token est blacklisté
+(voir users/introspection.py).
+"""
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+REFRESH_JTI_CLAIM = 'refresh_jti'
+
+
+class SessionRefreshToken(RefreshToken):
+    """RefreshToken dont les access tokens référencent le jti de la session."""
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        access[REFRESH_JTI_CLAIM] = self[api_settings.JTI_CLAIM]
+        return access
@@ -7,11 +7,13 @@ Endpoints disponibles :
 - POST /api/auth/signout/ → Déconnexion
 - POST /api/auth/refresh/ → Renouveler le token
 - GET  /api/auth/me/      → Utilisateur connecté
+- POST /api/auth/internal/users/ → Résolution d'utilisateurs en masse (services internes)
+- POST /api/auth/introspect/     → Introspection de tokens (serveurs de ressources)
 """
 
 from django.urls import path
 
-from .views import SignInView, SignOutView, MeView, RefreshView, SignUpView
+from .views import BulkUserView, IntrospectionView, SignInView, SignOutView, MeView, RefreshView, SignUpView
 
 app_name = 'users'
 
@@ -21,4 +23,6 @@ urlpatterns = [
     path('signout/', SignOutView.as_view(), name='signout'),
     path('refresh/', RefreshView.as_view(), name='refresh'),
     path('me/', MeView.as_view(), name='me'),
+    path('internal/users/', BulkUserView.as_view(), name='internal-users'),
+    path('introspect/', IntrospectionView.as_view(), name='introspect'),
 ]
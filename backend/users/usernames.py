@@ -0,0 +1,73 @@
+"""
+Génération automatique des noms d'utilisateur.
+
+Format : 4 premières lettres du nom + 2 premières lettres du prénom,
+suivies d'un compteur en cas de doublon.
+    Salim Bouskine → boussa, puis boussa1, boussa2...
+
+Le prochain suffixe libre est calculé en UNE requête (agrégat sur les
+usernames qui commencent par le radical, via l'index unique du champ)
+au lieu d'une boucle de .exists(). La concurrence entre deux inscriptions
+simultanées est gérée par la contrainte unique : voir SignUpSerializer.create().
+
+Si le compteur dépasse MAX_SUFFIX_DIGITS chiffres (ex. un username radical +
+999999999 choisi à la main), le suffixe suivant serait invisible pour la
+requête : on passe alors à un suffixe aléatoire de MAX_SUFFIX_DIGITS chiffres.
+"""
+
+import random
+import re
+
+from django.contrib.auth import get_user_model
+from django.db.models import BigIntegerField, Count, Max, Q, Value
+from django.db.models.functions import Cast, NullIf, Substr
+from django.utils.text import slugify
+
+User = get_user_model()
+
+# Radical par défaut si le nom et le prénom ne contiennent aucun caractère utilisable
+DEFAULT_STEM = 'user'
+
+# Nombre maximum de chiffres du suffixe (reste dans un BIGINT)
+MAX_SUFFIX_DIGITS = 9
+
+
+def username_stem(first_name, last_name):
+    """
+    Radical du username : 4 lettres du nom + 2 lettres du prénom.
+
+    Les accents et caractères spéciaux sont supprimés (Élodie → elodie).
+    """
+    first = slugify(first_name).replace('-', '')
+    last = slugify(last_name).replace('-', '')
+    return f"{last[:4]}{first[:2]}" or DEFAULT_STEM
+
+
+def next_username(stem):
+    """
+    Retourne le premier username disponible pour ce radical.
+
+    Une seule requête : on compte le radical exact et on prend le plus
+    grand suffixe numérique parmi les usernames de la forme radical + chiffres.
+    """
+    suffix = Cast(NullIf(Substr('username', len(stem) + 1), Value('')), BigIntegerField())
+
+    stats = (
+        User.objects
+        .filter(username__startswith=stem)   # Utilise l'index (LIKE 'radical%')
+        .filter(username__regex=rf'^{re.escape(stem)}[0-9]{{0,{MAX_SUFFIX_DIGITS}}}$')
+        .aggregate(
+            exact=Count('pk', filter=Q(username=stem)),
+            max_suffix=Max(suffix),
+        )
+    )
+
+    if not stats['exact']:
+        return stem
+
+    next_suffix = (stats['max_suffix'] or 0) + 1
+    if next_suffix >= 10 ** MAX_SUFFIX_DIGITS:
+        # Compteur saturé : un suffixe aléatoire, les collisions éventuelles
+        # sont gérées comme les autres par la contrainte unique
+        next_suffix = random.randrange(10 ** (MAX_SUFFIX_DIGITS - 1), 10 ** MAX_SUFFIX_DIGITS)
+    return f"{stem}{next_suffix}"
@@ -7,6 +7,8 @@ Ce module implémente les endpoints d'authentification :
 - POST /signout/ → Se déconnecter (supprime les cookies)
 - POST /refresh/ → Renouveler l'access token
 - GET  /me/      → Récupérer l'utilisateur connecté
+- POST /internal/users/ → Résoudre des utilisateurs en masse (services internes)
+- POST /introspect/     → Introspection de tokens (serveurs de ressources)
 
 Flux d'authentification :
 1. L'utilisateur s'inscrit via /signup/
@@ -16,16 +18,32 @@ Flux d'authentification :
 5. L'utilisateur se déconnecte via /signout/ → cookies supprimés
 """
 
+import logging
+
 from django.conf import settings
 from django.contrib.auth import authenticate
+from django.db import transaction
+from django.utils.crypto import salted_hmac
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from .serializers import SignInSerializer, SignUpSerializer, UserSerializer
+from .cache import get_profiles
+from .introspection import introspect_tokens, invalidate_introspection
+from .permissions import IsInternalService
+from .serializers import (
+    BulkUserLookupSerializer,
+    IntrospectionSerializer,
+    SignInSerializer,
+    SignUpSerializer,
+    UserSerializer,
+)
+from .tasks import send_welcome_email
+from .tokens import SessionRefreshToken
+
+logger = logging.getLogger(__name__)
 
 
 class SignUpView(APIView):
@@ -34,7 +52,7 @@ class SignUpView(APIView):
 
     POST /api/auth/signup/
 
-    Données :
+    Données (username optionnel, généré à partir du nom et du prénom si absent) :
     {
         "username": "boussa",
         "first_name": "Salim",
@@ -53,10 +71,16 @@ class SignUpView(APIView):
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+
+        # Le travail post-inscription (email...) est mis en file dans la même
+        # transaction que la création du compte et exécuté par le worker
+        with transaction.atomic():
+            user = serializer.save()
+            send_welcome_email.enqueue(user_id=str(user.pk))
+        logger.info("Inscription", extra={'event': 'auth.signup', 'user_id': str(user.pk)})
 
         # Générer les tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = SessionRefreshToken.for_user(user)
 
         response = Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
 
@@ -107,6 +131,10 @@ class SignInView(APIView):
         serializer = SignInSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        # authenticate() vérifie le mot de passe via user.check_password() :
+        # si le hash a été créé avec un autre algorithme ou un autre coût que
+        # ceux de PASSWORD_HASHERS, il est re-hashé et sauvegardé ici même
+        # (migration progressive des utilisateurs, voir users/hashers.py)
         user = authenticate(
             request,
             username=serializer.validated_data['username'],
@@ -114,13 +142,22 @@ class SignInView(APIView):
         )
 
         if user is None:
+            # Jamais le username saisi en clair : c'est parfois le mot de passe.
+            # Une empreinte tronquée (HMAC, SECRET_KEY) suffit à regrouper les échecs
+            username_hash = salted_hmac('auth.signin_failed', serializer.validated_data['username']).hexdigest()[:12]
+            logger.info(
+                "Échec de connexion",
+                extra={'event': 'auth.signin_failed', 'username_hash': username_hash},
+            )
             return Response(
                 {'error': 'Nom d\'utilisateur ou mot de passe incorrect'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+        logger.info("Connexion", extra={'event': 'auth.signin', 'user_id': str(user.pk)})
+
         # Générer les tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = SessionRefreshToken.for_user(user)
 
         # Préparer la réponse
         response = Response(UserSerializer(user).data, status=status.HTTP_200_OK)
@@ -166,12 +203,20 @@ class SignOutView(APIView):
         
         if refresh_token:
             try:
-                token = RefreshToken(refresh_token)
+                token = SessionRefreshToken(refresh_token)
                 token.blacklist()
             except TokenError:
                 # Token déjà invalide, on continue
                 pass
         
+        # Les serveurs de ressources doivent voir la révocation immédiatement :
+        # l'access token est lié au refresh token blacklisté (voir users/tokens.py)
+        for cookie in ('access_token', 'refresh_token'):
+            if request.COOKIES.get(cookie):
+                invalidate_introspection(request.COOKIES[cookie])
+        
+        logger.info("Déconnexion", extra={'event': 'auth.signout', 'user_id': str(request.user.pk)})
+
         # Préparer la réponse et supprimer les cookies
         response = Response({'message': 'Déconnexion réussie'})
         response.delete_cookie('access_token')
@@ -210,8 +255,12 @@ class RefreshView(APIView):
         
         try:
             # Valider le refresh token et générer un nouvel access token
-            refresh = RefreshToken(refresh_token)
+            refresh = SessionRefreshToken(refresh_token)
             access = refresh.access_token
+            logger.info(
+                "Token renouvelé",
+                extra={'event': 'auth.refresh', 'user_id': refresh.payload.get(settings.SIMPLE_JWT['USER_ID_CLAIM'])},
+            )
             
             response = Response({'message': 'Token renouvelé'})
             
@@ -229,6 +278,7 @@ class RefreshView(APIView):
             return response
             
         except TokenError:
+            logger.info("Refresh token refusé", extra={'event': 'auth.refresh_failed'})
             return Response(
                 {'error': 'Refresh token invalide ou expiré'},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -249,4 +299,89 @@ class MeView(APIView):
     
     def get(self, request):
         # request.user est rempli automatiquement par CookieJWTAuthentication
+        # Événement à fort volume : échantillonné (voir LOGGING dans settings.py)
+        logger.info("Profil consulté", extra={'event': 'auth.me', 'user_id': str(request.user.pk)})
         return Response(UserSerializer(request.user).data)
+
+
+class BulkUserView(APIView):
+    """
+    Résolution d'utilisateurs en masse, pour les autres services backend.
+    
+    POST /api/auth/internal/users/
+    Header : X-Internal-Token: <INTERNAL_API_TOKEN>
+    
+    Transforme une liste d'UUID (claim user_id des JWT) en profils en un seul
+    appel : cache par identifiant, puis une seule requête id__in pour le reste.
+    
+    Payload :
+    {
+        "ids": ["3f1c...", "9a2b..."],
+        "fields": ["first_name", "last_name"]
+    }
+    
+    Réponses :
+    - 200 : {"results": [profils, dans l'ordre des ids], "missing": [ids inconnus]}
+    - 400 : Payload invalide (plus de INTERNAL_BULK_MAX_IDS ids, champ inconnu...)
+    - 403 : Token de service interne invalide
+    """
+    authentication_classes = []  # Pas de cookies : authentifié par IsInternalService
+    permission_classes = [IsInternalService]
+    
+    def post(self, request):
+        serializer = BulkUserLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        # Dédoublonne en gardant l'ordre de la demande
+        ids = list(dict.fromkeys(str(user_id) for user_id in serializer.validated_data['ids']))
+        fields = serializer.validated_data.get('fields')
+        
+        profiles = get_profiles(ids)
+        
+        results = []
+        for user_id in ids:
+            profile = profiles.get(user_id)
+            if profile is not None:
+                if fields:
+                    profile = {key: value for key, value in profile.items() if key in fields or key == 'id'}
+                results.append(profile)
+        
+        return Response({
+            'results': results,
+            'missing': [user_id for user_id in ids if user_id not in profiles],
+        })
+
+
+class IntrospectionView(APIView):
+    """
+    Introspection de tokens (RFC 7662), pour les services qui partagent nos cookies.
+    
+    POST /api/auth/introspect/
+    Header : X-Internal-Token: <INTERNAL_API_TOKEN>
+    
+    Vérifie la signature, l'expiration, la blacklist et que l'utilisateur est
+    actif, sans que le service ait à dupliquer CookieJWTAuthentication.
+    Réponses en cache jusqu'à exp ou INTROSPECTION_CACHE_TTL (voir users/introspection.py).
+    
+    Payload :
+        token=eyJ...                            (un token, JSON ou formulaire)
+        {"tokens": ["eyJ...", "eyJ..."]}        (plusieurs tokens)
+    
+    Réponses :
+    - 200 : {"active": true, "sub": "...", "username": "...", "exp": ..., ...}
+            {"active": false} si le token est invalide, expiré ou révoqué
+            {"results": [...]} pour plusieurs tokens, dans le même ordre
+    - 400 : Payload invalide
+    - 403 : Token de service interne invalide
+    """
+    authentication_classes = []  # Pas de cookies : authentifié par IsInternalService
+    permission_classes = [IsInternalService]
+    
+    def post(self, request):
+        serializer = IntrospectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        if 'token' in serializer.validated_data:
+            return Response(introspect_tokens([serializer.validated_data['token']])[0])
+        
+        return Response({'results': introspect_tokens(serializer.validated_data['tokens'])})